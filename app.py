@@ -1,18 +1,80 @@
+import atexit
+import csv
+import io
 import json
+import os
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
+import click
 import requests
-from flask import Flask, flash, redirect, render_template, request, url_for
+from flask import (
+    Flask,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import FlaskForm
+from jinja2 import FileSystemBytecodeCache
+from requests.adapters import HTTPAdapter
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError, SQLAlchemyError
+from urllib3.util.retry import Retry
 from wtforms import StringField, SubmitField, TextAreaField
 from wtforms.validators import DataRequired, Length
 
-from config import Config
+from config import Config, env_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 db = SQLAlchemy()
 
+_SESSION = requests.Session()
+_SESSION.headers["Accept"] = "application/json"
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+atexit.register(_SESSION.close)
+
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 class ChatMessage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -21,6 +83,21 @@ class ChatMessage(db.Model):
     direction = db.Column(db.String(16), nullable=False)  # "outgoing", "incoming", "service"
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_chatmessage_created_at", created_at.desc()),
+        db.Index("ix_chatmessage_chat_id_created_at", chat_id, created_at.desc()),
+    )
+
+
+def message_to_dict(msg: ChatMessage) -> dict:
+    return {
+        "id": msg.id,
+        "chat_id": msg.chat_id,
+        "message": msg.message,
+        "direction": msg.direction,
+        "created_at": msg.created_at.strftime("%d/%m/%Y %H:%M:%S"),
+    }
+
 
 class SendMessageForm(FlaskForm):
     chat_id = StringField(
@@ -39,34 +116,61 @@ class SyncMessagesForm(FlaskForm):
     submit = SubmitField("Sincronizar mensajes")
 
 
-def green_api_request(
-    app: Flask, method: str, endpoint: str, data: Optional[dict] = None
-) -> dict:
+DEFAULT_GREEN_API_TIMEOUT = 15.0
+
+
+def _coerce_timeout(value) -> Union[float, tuple[float, float]]:
+    if isinstance(value, (list, tuple)):
+        if len(value) >= 2:
+            return (float(value[0]), float(value[1]))
+        value = value[0] if value else DEFAULT_GREEN_API_TIMEOUT
+    return float(value)
+
+
+def init_green_api(app: Flask) -> None:
     instance_id = app.config.get("GREEN_INSTANCE_ID")
     token = app.config.get("GREEN_API_TOKEN")
     base_url = app.config.get("GREEN_API_URL")
 
-    if not instance_id or not token:
+    prefix = None
+    if instance_id and token:
+        prefix = f"{base_url}/waInstance{instance_id}"
+    app.extensions["green"] = {
+        "prefix": prefix,
+        "token": token,
+        "timeout": _coerce_timeout(
+            app.config.get("GREEN_API_TIMEOUT", DEFAULT_GREEN_API_TIMEOUT)
+        ),
+        # receiptIds already stored whose deleteNotification has not succeeded.
+        "undeleted": set(),
+    }
+
+
+def green_api_request(
+    app: Flask,
+    method: str,
+    endpoint: str,
+    data: Optional[dict] = None,
+    timeout=None,
+) -> dict:
+    green = app.extensions["green"]
+    if green["prefix"] is None:
         raise RuntimeError(
             "GREEN_INSTANCE_ID y GREEN_API_TOKEN deben estar configurados."
         )
 
-    url = f"{base_url}/waInstance{instance_id}/{endpoint}/{token}"
+    url = f"{green['prefix']}/{endpoint}/{green['token']}"
     try:
-        timeout = app.config.get("GREEN_API_TIMEOUT", 15)
-        if isinstance(timeout, (list, tuple)):
-            timeout_value = tuple(timeout)
-        else:
-            timeout_value = timeout
-
-        request_kwargs: dict = {"timeout": timeout_value}
+        request_kwargs: dict = {
+            "timeout": green["timeout"] if timeout is None else timeout
+        }
         normalized_method = method.upper()
         if normalized_method in {"POST", "PUT", "PATCH"} and data is not None:
             request_kwargs["json"] = data
         elif data:
             request_kwargs["params"] = data
 
-        response = requests.request(normalized_method, url, **request_kwargs)
+        response = _SESSION.request(normalized_method, url, **request_kwargs)
         response.raise_for_status()
     except requests.HTTPError as exc:
         raise RuntimeError(f"Green-API devolvió un error: {exc}") from exc
@@ -75,12 +179,15 @@ def green_api_request(
 
     if not response.content:
         return {}
-    return response.json()
+    try:
+        return json_loads(response.content)
+    except ValueError as exc:
+        raise RuntimeError(f"Respuesta inválida de Green-API: {exc}") from exc
 
 
 def summarize_payload(data: dict, type_hint: str) -> str:
     try:
-        summary = json.dumps(data, ensure_ascii=False)
+        summary = json_dumps(data)
     except (TypeError, ValueError):
         summary = str(data)
     if len(summary) > 700:
@@ -88,34 +195,59 @@ def summarize_payload(data: dict, type_hint: str) -> str:
     return f"[{type_hint}] {summary}"
 
 
+def _text_message(message_data: dict) -> Optional[str]:
+    return message_data.get("textMessageData", {}).get("textMessage")
+
+
+def _extended_text_message(message_data: dict) -> Optional[str]:
+    return message_data.get("extendedTextMessageData", {}).get("textMessage")
+
+
+def _image_message(message_data: dict) -> Optional[str]:
+    caption = message_data.get("imageMessageData", {}).get("caption")
+    return caption or "[Imagen recibida]"
+
+
+def _video_message(message_data: dict) -> Optional[str]:
+    caption = message_data.get("videoMessageData", {}).get("caption")
+    return caption or "[Video recibido]"
+
+
+def _audio_message(message_data: dict) -> Optional[str]:
+    return "[Audio recibido]"
+
+
+def _sticker_message(message_data: dict) -> Optional[str]:
+    return "[Sticker recibido]"
+
+
+def _document_message(message_data: dict) -> Optional[str]:
+    file_name = message_data.get("documentMessageData", {}).get("fileName")
+    return f"[Documento recibido: {file_name or 'sin nombre'}]"
+
+
+MESSAGE_EXTRACTORS = {
+    "textMessage": _text_message,
+    "extendedTextMessage": _extended_text_message,
+    "imageMessage": _image_message,
+    "videoMessage": _video_message,
+    "audioMessage": _audio_message,
+    "stickerMessage": _sticker_message,
+    "documentMessage": _document_message,
+}
+
+OUTGOING_WEBHOOKS = frozenset({"outgoingMessageReceived", "outgoingAPIMessageReceived"})
+
+
 def extract_message_text(body: dict) -> Optional[str]:
     message_data = body.get("messageData") or {}
     type_message = message_data.get("typeMessage")
 
-    if type_message == "textMessage":
-        text = message_data.get("textMessageData", {}).get("textMessage")
+    extractor = MESSAGE_EXTRACTORS.get(type_message)
+    if extractor is not None:
+        text = extractor(message_data)
         if text:
             return text
-    elif type_message == "extendedTextMessage":
-        text = message_data.get("extendedTextMessageData", {}).get("textMessage")
-        if text:
-            return text
-    elif type_message == "imageMessage":
-        image_data = message_data.get("imageMessageData", {})
-        caption = image_data.get("caption")
-        return caption or "[Imagen recibida]"
-    elif type_message == "videoMessage":
-        video_data = message_data.get("videoMessageData", {})
-        caption = video_data.get("caption")
-        return caption or "[Video recibido]"
-    elif type_message == "audioMessage":
-        return "[Audio recibido]"
-    elif type_message == "stickerMessage":
-        return "[Sticker recibido]"
-    elif type_message == "documentMessage":
-        doc_data = message_data.get("documentMessageData", {})
-        file_name = doc_data.get("fileName")
-        return f"[Documento recibido: {file_name or 'sin nombre'}]"
 
     if message_data:
         return summarize_payload(message_data, type_message or "evento")
@@ -131,76 +263,395 @@ def determine_direction(body: dict) -> str:
     type_webhook = body.get("typeWebhook")
     if type_webhook == "incomingMessageReceived":
         return "incoming"
-    if type_webhook in {"outgoingMessageReceived", "outgoingAPIMessageReceived"}:
+    if type_webhook in OUTGOING_WEBHOOKS:
         return "outgoing"
     return "service"
 
 
-def sync_incoming_messages(app: Flask) -> int:
-    processed = 0
-    max_pulls = max(app.config.get("GREEN_API_MAX_PULL", 10), 1)
-    iterations = 0
+COPY_THRESHOLD = 100
+COPY_COLUMNS = ("chat_id", "message", "direction", "created_at")
+
+
+def _bulk_copy(rows: list[dict]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            (row["chat_id"], row["message"], row["direction"], row["created_at"].isoformat())
+        )
+    buffer.seek(0)
+
+    raw = db.session.connection().connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {ChatMessage.__tablename__} ({', '.join(COPY_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
 
-    while iterations < max_pulls:
-        iterations += 1
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def init_engine_options(app: Flask) -> None:
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if make_url(uri).get_backend_name() == "sqlite":
+        return
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+        "pool_size": app.config["DB_POOL_SIZE"],
+        "max_overflow": app.config["DB_MAX_OVERFLOW"],
+        "pool_timeout": app.config["DB_POOL_TIMEOUT"],
+    }
+
+
+def init_db_durability(app: Flask) -> None:
+    if not app.config.get("DB_RELAXED_DURABILITY"):
+        return
+    if db.engine.dialect.name == "sqlite":
+        event.listen(db.engine, "connect", _set_sqlite_pragmas)
+
+
+def use_bulk_copy(app: Flask, dialect, row_count: int) -> bool:
+    # copy_expert only exists on psycopg2 cursors, not on psycopg 3.
+    return (
+        bool(app.config.get("DB_BULK_COPY"))
+        and row_count >= COPY_THRESHOLD
+        and dialect.name == "postgresql"
+        and dialect.driver == "psycopg2"
+    )
+
+
+def store_messages(app: Flask, rows: list[dict]) -> None:
+    if not rows:
+        return
+    is_postgresql = db.engine.dialect.name == "postgresql"
+    if is_postgresql and app.config.get("DB_RELAXED_DURABILITY"):
+        # Opt-in: chat ingest may lose the last few acknowledged rows on crash.
+        db.session.execute(text("SET LOCAL synchronous_commit = off"))
+    if use_bulk_copy(app, db.engine.dialect, len(rows)):
+        _bulk_copy(rows)
+    else:
+        db.session.execute(insert(ChatMessage), rows)
+    db.session.commit()
+
+
+INBOX_MAX_SIZE = 10000
+INBOX_BATCH_SIZE = 500
+INBOX_POLL_INTERVAL = 0.05
+INBOX_RETRY_DELAY = 0.5
+INBOX_MAX_RETRY_DELAY = 30
+INBOX_MAX_ATTEMPTS = 5
+
+
+def init_inbox(app: Flask) -> None:
+    app.extensions["inbox"] = {
+        "queue": queue.Queue(maxsize=INBOX_MAX_SIZE),
+        "lock": threading.Lock(),
+        "thread": None,
+    }
+
+
+def _drain_up_to(inbox: queue.Queue, limit: int, timeout: float) -> list[dict]:
+    try:
+        rows = [inbox.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while len(rows) < limit:
         try:
-            notification = green_api_request(app, "GET", "receiveNotification")
-        except RuntimeError as exc:
-            original = getattr(exc, "__cause__", None)
-            if (
-                isinstance(original, requests.HTTPError)
-                and original.response is not None
-                and original.response.status_code == 404
-            ):
-                break
-            raise
+            rows.append(inbox.get_nowait())
+        except queue.Empty:
+            break
+    return rows
+
+
+def _store_inbox_batch(app: Flask, rows: list[dict]) -> Optional[Exception]:
+    with app.app_context():
+        try:
+            store_messages(app, rows)
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception(
+                "No se pudieron guardar %s mensajes del webhook", len(rows)
+            )
+            return exc
+    return None
+
+
+def _write_inbox_rows(app: Flask, rows: list[dict]) -> None:
+    # Webhook messages were already acknowledged, so connection problems are
+    # retried until the database is back. Other errors point at bad data: after
+    # a few attempts the batch is split and only the rejected rows are dropped.
+    delay = INBOX_RETRY_DELAY
+    attempts = 0
+    while True:
+        error = _store_inbox_batch(app, rows)
+        if error is None:
+            return
+        attempts += 1
+        transient = isinstance(error, (OperationalError, InterfaceError))
+        if attempts >= INBOX_MAX_ATTEMPTS and not transient:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, INBOX_MAX_RETRY_DELAY)
+
+    if len(rows) == 1:
+        app.logger.error(
+            "Mensaje del webhook descartado tras %s intentos: %r", attempts, rows[0]
+        )
+        return
+    for row in rows:
+        _write_inbox_rows(app, [row])
+
+
+def _run_inbox_writer(app: Flask) -> None:
+    inbox = app.extensions["inbox"]["queue"]
+    while True:
+        try:
+            rows = _drain_up_to(inbox, INBOX_BATCH_SIZE, INBOX_POLL_INTERVAL)
+            if rows:
+                _write_inbox_rows(app, rows)
+        except Exception:
+            app.logger.exception("Error inesperado en el escritor del webhook")
+
+
+def _flush_remaining(app: Flask) -> None:
+    inbox = app.extensions["inbox"]["queue"]
+    while True:
+        rows = _drain_up_to(inbox, INBOX_BATCH_SIZE, 0)
+        if not rows or _store_inbox_batch(app, rows) is not None:
+            return
+
+
+def start_inbox_writer(app: Flask) -> None:
+    inbox = app.extensions["inbox"]
+    if inbox["thread"] is not None and inbox["thread"].is_alive():
+        return
+    with inbox["lock"]:
+        thread = inbox["thread"]
+        if thread is not None and thread.is_alive():
+            return
+        if thread is None:
+            atexit.register(_flush_remaining, app)
+        inbox["thread"] = threading.Thread(
+            target=_run_inbox_writer, args=(app,), name="inbox-writer", daemon=True
+        )
+        inbox["thread"].start()
+
+
+def _long_poll_timeout(app: Flask, receive_timeout: int):
+    timeout = app.extensions["green"]["timeout"]
+    if isinstance(timeout, tuple):
+        return (timeout[0], max(timeout[1], receive_timeout + 5))
+    return max(timeout, receive_timeout + 5)
+
+
+def _receive_notification(
+    app: Flask, receive_timeout: Optional[int] = None
+) -> Optional[dict]:
+    receive_params = None
+    receive_http_timeout = None
+    if receive_timeout is not None:
+        receive_params = {"receiveTimeout": receive_timeout}
+        receive_http_timeout = _long_poll_timeout(app, receive_timeout)
+
+    try:
+        return green_api_request(
+            app,
+            "GET",
+            "receiveNotification",
+            data=receive_params,
+            timeout=receive_http_timeout,
+        )
+    except RuntimeError as exc:
+        original = getattr(exc, "__cause__", None)
+        if (
+            isinstance(original, requests.HTTPError)
+            and original.response is not None
+            and original.response.status_code == 404
+        ):
+            return None
+        raise
+
+
+def _notification_row(app: Flask, notification: dict) -> Optional[dict]:
+    body = notification.get("body", {})
+    chat_id = body.get("senderData", {}).get("chatId")
+    if not chat_id:
+        app.logger.info(
+            "Notificación sin chatId descartada: %s",
+            summarize_payload(body, "sin-chat"),
+        )
+        return None
+
+    message_text = extract_message_text(body)
+    if not message_text:
+        app.logger.info(
+            "Notificación sin contenido legible: %s",
+            summarize_payload(body, "sin-texto"),
+        )
+        return None
+
+    return {
+        "chat_id": chat_id,
+        "message": message_text,
+        "direction": determine_direction(body),
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _store_notification(app: Flask, notification: dict) -> bool:
+    if notification.get("receiptId") in app.extensions["green"]["undeleted"]:
+        return False
+    row = _notification_row(app, notification)
+    if row is None:
+        return False
+    store_messages(app, [row])
+    return True
+
+
+def _delete_notification(app: Flask, notification: dict) -> None:
+    receipt_id = notification.get("receiptId")
+    if receipt_id:
+        undeleted = app.extensions["green"]["undeleted"]
+        undeleted.add(receipt_id)
+        green_api_request(app, "DELETE", f"deleteNotification/{receipt_id}")
+        undeleted.discard(receipt_id)
 
+
+def sync_incoming_messages(app: Flask) -> int:
+    max_pulls = max(app.config.get("GREEN_API_MAX_PULL", 10), 1)
+    processed = 0
+
+    for _ in range(max_pulls):
+        notification = _receive_notification(app)
         if not notification:
             break
 
-        receipt_id = notification.get("receiptId")
-        body = notification.get("body", {})
-        chat_id = body.get("senderData", {}).get("chatId")
-        if not chat_id:
-            app.logger.info(
-                "Notificación sin chatId descartada: %s",
-                summarize_payload(body, "sin-chat"),
+        # Commit before deleting: if the insert fails, Green-API redelivers the
+        # notification instead of it being lost.
+        try:
+            processed += _store_notification(app, notification)
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            app.logger.exception("No se pudo guardar la notificación")
+            raise RuntimeError(f"No se pudo guardar la notificación: {exc}") from exc
+
+        # Green-API keeps returning the head of the queue until it is deleted,
+        # so the DELETE must finish before the next receiveNotification.
+        try:
+            _delete_notification(app, notification)
+        except RuntimeError as exc:
+            app.logger.warning(
+                "No se pudo eliminar notificación %s: %s",
+                notification.get("receiptId"),
+                exc,
             )
-        else:
-            message_text = extract_message_text(body)
-            if message_text:
-                direction = determine_direction(body)
-                msg = ChatMessage(
-                    chat_id=chat_id,
-                    message=message_text,
-                    direction=direction,
-                )
-                db.session.add(msg)
-                db.session.commit()
-                processed += 1
-            else:
-                app.logger.info(
-                    "Notificación sin contenido legible: %s",
-                    summarize_payload(body, "sin-texto"),
-                )
+            break
+
+    return processed
+
 
-        if receipt_id:
+def listen_for_notification(app: Flask, receive_timeout: int) -> int:
+    notification = _receive_notification(app, receive_timeout)
+    if not notification:
+        return 0
+
+    # Same ordering as sync_incoming_messages: commit, then delete.
+    stored = _store_notification(app, notification)
+    _delete_notification(app, notification)
+    return int(stored)
+
+
+POLLER_RETRY_DELAY = 5
+MESSAGES_POLL_INTERVAL = 0.5
+MESSAGES_PAGE_SIZE = 200
+
+
+def run_notification_listener(app: Flask) -> None:
+    receive_timeout = app.config.get("GREEN_API_RECEIVE_TIMEOUT", 20)
+    while True:
+        with app.app_context():
             try:
-                green_api_request(app, "DELETE", f"deleteNotification/{receipt_id}")
-            except RuntimeError as exc:
-                app.logger.warning("No se pudo eliminar notificación %s: %s", receipt_id, exc)
+                listen_for_notification(app, receive_timeout)
+            except (RuntimeError, SQLAlchemyError) as exc:
+                db.session.rollback()
+                app.logger.warning("Error al escuchar notificaciones: %s", exc)
+                time.sleep(POLLER_RETRY_DELAY)
+
+
+def health_shortcut(wsgi_app):
+    def middleware(environ, start_response):
+        if (
+            environ.get("PATH_INFO") == "/health"
+            and environ.get("REQUEST_METHOD") == "GET"
+        ):
+            start_response(
+                "200 OK",
+                [("Content-Type", "text/plain"), ("Content-Length", "2")],
+            )
+            return [b"OK"]
+        return wsgi_app(environ, start_response)
 
-    return processed
+    return middleware
 
 
 def create_app(config_class: type[Config] = Config) -> Flask:
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.config.update(env_settings(config_class, app.logger))
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
+    init_engine_options(app)
     db.init_app(app)
+    init_green_api(app)
+    init_inbox(app)
+    app.extensions["message_polls"] = threading.BoundedSemaphore(
+        max(app.config.get("MESSAGES_MAX_POLLERS", 2), 1)
+    )
+
+    jinja_cache_dir = app.config.get("JINJA_CACHE_DIR")
+    if jinja_cache_dir:
+        try:
+            os.makedirs(jinja_cache_dir, exist_ok=True)
+        except OSError as exc:
+            app.logger.warning("Caché de plantillas desactivada: %s", exc)
+        else:
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
 
     with app.app_context():
+        init_db_durability(app)
+        if app.config.get("DB_AUTO_CREATE"):
+            db.create_all()
+
+    @app.cli.command("init-db")
+    def init_db() -> None:
         db.create_all()
+        # create_all() skips indexes on tables that already exist.
+        for index in ChatMessage.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+        click.echo("Base de datos inicializada.")
+
+    @app.cli.command("listen-notifications")
+    def listen_notifications() -> None:
+        if not app.config.get("GREEN_API_LONG_POLL"):
+            raise click.ClickException(
+                "Activa GREEN_API_LONG_POLL=true para usar la escucha continua."
+            )
+        if app.extensions["green"]["prefix"] is None:
+            raise click.ClickException(
+                "GREEN_INSTANCE_ID y GREEN_API_TOKEN deben estar configurados."
+            )
+        click.echo("Escuchando notificaciones de Green-API...")
+        run_notification_listener(app)
+
+    app.wsgi_app = health_shortcut(app.wsgi_app)
 
     @app.route("/health")
     def health() -> tuple[str, int]:
@@ -217,12 +668,14 @@ def create_app(config_class: type[Config] = Config) -> Flask:
             }
             try:
                 green_api_request(app, "POST", "sendMessage", data=payload)
-                msg = ChatMessage(
-                    chat_id=form.chat_id.data,
-                    message=form.message.data,
-                    direction="outgoing",
+                db.session.execute(
+                    insert(ChatMessage).values(
+                        chat_id=form.chat_id.data,
+                        message=form.message.data,
+                        direction="outgoing",
+                        created_at=datetime.utcnow(),
+                    )
                 )
-                db.session.add(msg)
                 db.session.commit()
                 flash("Mensaje enviado correctamente.", "success")
                 return redirect(url_for("dashboard"))
@@ -240,6 +693,37 @@ def create_app(config_class: type[Config] = Config) -> Flask:
             messages=recent_messages,
         )
 
+    @app.get("/api/messages")
+    def api_messages():
+        since = request.args.get("since", 0, type=int)
+        wait = request.args.get("wait", 0, type=int)
+        wait = min(max(wait, 0), app.config.get("MESSAGES_MAX_WAIT", 20))
+        # Waiting requests hold a worker thread; past the cap, answer at once
+        # so webhooks and health checks are not starved.
+        waiting = wait > 0 and app.extensions["message_polls"].acquire(blocking=False)
+        if not waiting:
+            wait = 0
+        deadline = time.monotonic() + wait
+
+        try:
+            while True:
+                messages = (
+                    ChatMessage.query.filter(ChatMessage.id > since)
+                    .order_by(ChatMessage.id)
+                    .limit(MESSAGES_PAGE_SIZE)
+                    .all()
+                )
+                if messages or time.monotonic() >= deadline:
+                    break
+                # Give the connection back to the pool while waiting.
+                db.session.close()
+                time.sleep(MESSAGES_POLL_INTERVAL)
+        finally:
+            if waiting:
+                app.extensions["message_polls"].release()
+
+        return jsonify([message_to_dict(msg) for msg in messages])
+
     @app.post("/webhook/green")
     def green_webhook():
         payload = request.json or {}
@@ -248,21 +732,29 @@ def create_app(config_class: type[Config] = Config) -> Flask:
         message_text = extract_message_text(body)
 
         if chat_id and message_text:
-            direction = determine_direction(body)
-            msg = ChatMessage(
-                chat_id=chat_id,
-                message=message_text,
-                direction=direction,
-            )
-            db.session.add(msg)
-            db.session.commit()
+            row = {
+                "chat_id": chat_id,
+                "message": message_text,
+                "direction": determine_direction(body),
+                "created_at": datetime.utcnow(),
+            }
+            # Started on first use so CLI commands never spawn the writer.
+            start_inbox_writer(app)
+            try:
+                app.extensions["inbox"]["queue"].put_nowait(row)
+            except queue.Full:
+                store_messages(app, [row])
 
         return "", 200
 
     @app.post("/sync")
     def sync_notifications():
         form = SyncMessagesForm()
-        if form.validate_on_submit():
+        if app.config.get("GREEN_API_LONG_POLL"):
+            # The listener process owns the queue; a second consumer would
+            # race it for the same notification.
+            flash("La escucha continua ya sincroniza los mensajes.", "info")
+        elif form.validate_on_submit():
             try:
                 processed = sync_incoming_messages(app)
                 if processed:
@@ -1,3 +1,4 @@
+import logging
 import os
 from pathlib import Path
 
@@ -10,6 +11,49 @@ if ENV_PATH.exists():
     load_dotenv(ENV_PATH)
 
 
+def _parse_timeout(raw: str) -> tuple[int, ...]:
+    timeout = tuple(int(part) for part in raw.split(",") if part.strip())
+    if not timeout:
+        raise ValueError(raw)
+    return timeout
+
+
+ENV_PARSERS = {
+    "DB_POOL_SIZE": int,
+    "DB_MAX_OVERFLOW": int,
+    "DB_POOL_TIMEOUT": int,
+    "GREEN_API_TIMEOUT": _parse_timeout,
+    "GREEN_API_MAX_PULL": int,
+    "GREEN_API_RECEIVE_TIMEOUT": int,
+    "MESSAGES_MAX_WAIT": int,
+    "MESSAGES_MAX_POLLERS": int,
+}
+
+
+def _overrides(config_class: type, name: str) -> bool:
+    return any(
+        name in vars(klass)
+        for klass in config_class.__mro__
+        if klass is not Config and issubclass(klass, Config)
+    )
+
+
+def env_settings(config_class: type, logger: logging.Logger) -> dict:
+    # Explicit values on a Config subclass win over the environment.
+    settings = {}
+    for name, parse in ENV_PARSERS.items():
+        raw = os.environ.get(name)
+        if raw is None or _overrides(config_class, name):
+            continue
+        try:
+            settings[name] = parse(raw)
+        except ValueError:
+            logger.warning(
+                "Valor inválido %s=%r; se usa %r", name, raw, getattr(Config, name)
+            )
+    return settings
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "cambia-esto-en-produccion")
     GREEN_API_URL = os.environ.get("GREEN_API_URL", "https://7107.api.green-api.com")
@@ -21,12 +65,22 @@ class Config:
     )
     SQLALCHEMY_ECHO = os.environ.get("SQLALCHEMY_ECHO", "false").lower() == "true"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    GREEN_API_TIMEOUT = tuple(
-        int(part)
-        for part in os.environ.get("GREEN_API_TIMEOUT", "5,10").split(",")
-        if part.strip()
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True, "pool_recycle": 1800}
+    # Size the pool as roughly max concurrent requests + (workers * 2) + 10.
+    # Only applied to server databases; SQLite pools do not take these.
+    DB_POOL_SIZE = 10
+    DB_MAX_OVERFLOW = 20
+    DB_POOL_TIMEOUT = 30
+    JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR", "")
+    DB_AUTO_CREATE = os.environ.get("DB_AUTO_CREATE", "false").lower() == "true"
+    DB_RELAXED_DURABILITY = (
+        os.environ.get("DB_RELAXED_DURABILITY", "false").lower() == "true"
     )
-    GREEN_API_MAX_PULL = int(os.environ.get("GREEN_API_MAX_PULL", "10"))
-    GREEN_API_MAX_PULL = int(os.environ.get("GREEN_API_MAX_PULL", "10"))
-
+    DB_BULK_COPY = os.environ.get("DB_BULK_COPY", "false").lower() == "true"
+    GREEN_API_TIMEOUT = (5, 10)
+    GREEN_API_MAX_PULL = 10
+    GREEN_API_RECEIVE_TIMEOUT = 20
+    MESSAGES_MAX_WAIT = 20
+    MESSAGES_MAX_POLLERS = 2
+    GREEN_API_LONG_POLL = os.environ.get("GREEN_API_LONG_POLL", "false").lower() == "true"
 
@@ -0,0 +1,27 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app as app_module  # noqa: E402
+from config import Config  # noqa: E402
+
+
+class TestConfig(Config):
+    TESTING = True
+    WTF_CSRF_ENABLED = False
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    GREEN_API_URL = "https://green.test"
+    GREEN_INSTANCE_ID = "1"
+    GREEN_API_TOKEN = "token"
+    DB_AUTO_CREATE = True
+
+
+@pytest.fixture
+def app():
+    return app_module.create_app(TestConfig)
+
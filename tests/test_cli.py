@@ -0,0 +1,19 @@
+from sqlalchemy import inspect
+
+import app as app_module
+
+
+def test_init_db_adds_missing_indexes(app):
+    with app.app_context():
+        for index in app_module.ChatMessage.__table__.indexes:
+            index.drop(app_module.db.engine)
+
+    result = app.test_cli_runner().invoke(args=["init-db"])
+
+    assert result.exit_code == 0
+    with app.app_context():
+        names = {
+            index["name"]
+            for index in inspect(app_module.db.engine).get_indexes("chat_message")
+        }
+    assert names == {"ix_chatmessage_created_at", "ix_chatmessage_chat_id_created_at"}
@@ -0,0 +1,39 @@
+import logging
+
+import app as app_module
+from conftest import TestConfig
+
+
+def test_subclass_values_win_over_environment(monkeypatch):
+    monkeypatch.setenv("GREEN_API_MAX_PULL", "50")
+    monkeypatch.setenv("GREEN_API_TIMEOUT", "7,8")
+
+    class Overridden(TestConfig):
+        GREEN_API_MAX_PULL = 3
+        GREEN_API_TIMEOUT = (1, 2)
+
+    app = app_module.create_app(Overridden)
+
+    assert app.config["GREEN_API_MAX_PULL"] == 3
+    assert app.config["GREEN_API_TIMEOUT"] == (1, 2)
+    assert TestConfig.GREEN_API_MAX_PULL == 10
+
+
+def test_environment_values_are_parsed(monkeypatch):
+    monkeypatch.setenv("GREEN_API_MAX_PULL", "50")
+    monkeypatch.setenv("GREEN_API_TIMEOUT", "7,8")
+
+    app = app_module.create_app(TestConfig)
+
+    assert app.config["GREEN_API_MAX_PULL"] == 50
+    assert app.config["GREEN_API_TIMEOUT"] == (7, 8)
+
+
+def test_invalid_environment_value_keeps_default(monkeypatch, caplog):
+    monkeypatch.setenv("GREEN_API_MAX_PULL", "muchos")
+
+    with caplog.at_level(logging.WARNING):
+        app = app_module.create_app(TestConfig)
+
+    assert app.config["GREEN_API_MAX_PULL"] == 10
+    assert "GREEN_API_MAX_PULL" in caplog.text
@@ -0,0 +1,15 @@
+import time
+
+
+def test_long_poll_answers_immediately_when_all_slots_are_busy(app):
+    client = app.test_client()
+    slots = app.extensions["message_polls"]
+    while slots.acquire(blocking=False):
+        pass
+
+    started = time.monotonic()
+    response = client.get("/api/messages?since=0&wait=5")
+
+    assert response.status_code == 200
+    assert response.json == []
+    assert time.monotonic() - started < 1
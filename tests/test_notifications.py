@@ -0,0 +1,144 @@
+import pytest
+import requests
+
+import app as app_module
+
+
+class FakeResponse:
+    def __init__(self, payload=None, status_code=200, error=False):
+        self.status_code = status_code
+        self.error = error
+        self.content = b"" if payload is None else app_module.json_dumps(payload).encode()
+
+    def raise_for_status(self):
+        if self.error:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+def _notification(receipt_id, text):
+    return {
+        "receiptId": receipt_id,
+        "body": {
+            "typeWebhook": "incomingMessageReceived",
+            "senderData": {"chatId": "34600000000@c.us"},
+            "messageData": {
+                "typeMessage": "textMessage",
+                "textMessageData": {"textMessage": text},
+            },
+        },
+    }
+
+
+def test_listener_commits_before_deleting(app, monkeypatch):
+    pending = [_notification(1, "hola"), _notification(2, "adiós")]
+    stored_at_delete = []
+
+    def fake_request(method, url, **kwargs):
+        if method == "GET":
+            assert kwargs["params"] == {"receiveTimeout": 20}
+            return FakeResponse(pending.pop(0) if pending else None)
+        stored_at_delete.append(app_module.ChatMessage.query.count())
+        return FakeResponse({"result": True})
+
+    monkeypatch.setattr(app_module._SESSION, "request", fake_request)
+
+    with app.app_context():
+        assert app_module.listen_for_notification(app, 20) == 1
+        assert app_module.listen_for_notification(app, 20) == 1
+        assert app_module.listen_for_notification(app, 20) == 0
+
+    assert stored_at_delete == [1, 2]
+
+
+def test_listener_keeps_notification_when_insert_fails(app, monkeypatch):
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(method)
+        return FakeResponse(_notification(1, "hola"))
+
+    def failing_store(app, rows):
+        raise app_module.SQLAlchemyError("boom")
+
+    monkeypatch.setattr(app_module._SESSION, "request", fake_request)
+    monkeypatch.setattr(app_module, "store_messages", failing_store)
+
+    with app.app_context():
+        with pytest.raises(app_module.SQLAlchemyError):
+            app_module.listen_for_notification(app, 20)
+
+    assert calls == ["GET"]
+
+
+def test_sync_skips_pull_while_listener_enabled(app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        app_module._SESSION, "request", lambda *args, **kwargs: calls.append(args)
+    )
+    app.config["GREEN_API_LONG_POLL"] = True
+
+    response = app.test_client().post("/sync")
+
+    assert response.status_code == 302
+    assert calls == []
+
+
+def test_sync_commits_each_notification_before_deleting(app, monkeypatch):
+    pending = [_notification(1, "hola"), _notification(2, "adiós")]
+    stored_at_delete = []
+
+    def fake_request(method, url, **kwargs):
+        if method == "GET":
+            return FakeResponse(pending.pop(0) if pending else None)
+        stored_at_delete.append(app_module.ChatMessage.query.count())
+        return FakeResponse({"result": True})
+
+    monkeypatch.setattr(app_module._SESSION, "request", fake_request)
+
+    with app.app_context():
+        assert app_module.sync_incoming_messages(app) == 2
+
+    assert stored_at_delete == [1, 2]
+
+
+def test_sync_keeps_notification_when_insert_fails(app, monkeypatch):
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(method)
+        return FakeResponse(_notification(1, "hola"))
+
+    def failing_store(app, rows):
+        raise app_module.SQLAlchemyError("boom")
+
+    monkeypatch.setattr(app_module._SESSION, "request", fake_request)
+    monkeypatch.setattr(app_module, "store_messages", failing_store)
+
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            app_module.sync_incoming_messages(app)
+
+    assert calls == ["GET"]
+
+
+def test_listener_does_not_store_twice_after_failed_delete(app, monkeypatch):
+    deletes = []
+
+    def fake_request(method, url, **kwargs):
+        if method == "GET":
+            return FakeResponse(_notification(7, "hola"))
+        deletes.append(url)
+        if len(deletes) == 1:
+            return FakeResponse(status_code=500, error=True)
+        return FakeResponse({"result": True})
+
+    monkeypatch.setattr(app_module._SESSION, "request", fake_request)
+
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            app_module.listen_for_notification(app, 20)
+        assert app_module.listen_for_notification(app, 20) == 0
+        assert app_module.ChatMessage.query.count() == 1
+
+    assert len(deletes) == 2
+    assert app.extensions["green"]["undeleted"] == set()
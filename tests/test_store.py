@@ -0,0 +1,41 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import app as app_module
+
+PSYCOPG2 = SimpleNamespace(name="postgresql", driver="psycopg2")
+
+
+@pytest.mark.parametrize(
+    ("enabled", "dialect", "row_count", "expected"),
+    [
+        (True, PSYCOPG2, app_module.COPY_THRESHOLD, True),
+        (True, PSYCOPG2, app_module.COPY_THRESHOLD - 1, False),
+        (False, PSYCOPG2, app_module.COPY_THRESHOLD, False),
+        (True, SimpleNamespace(name="postgresql", driver="psycopg"), 500, False),
+        (True, SimpleNamespace(name="sqlite", driver="pysqlite"), 500, False),
+    ],
+)
+def test_use_bulk_copy(app, enabled, dialect, row_count, expected):
+    app.config["DB_BULK_COPY"] = enabled
+    assert app_module.use_bulk_copy(app, dialect, row_count) is expected
+
+
+def test_store_messages_falls_back_to_insert(app, monkeypatch):
+    app.config["DB_BULK_COPY"] = True
+    monkeypatch.setattr(app_module, "_bulk_copy", pytest.fail)
+    rows = [
+        {
+            "chat_id": "34600000000@c.us",
+            "message": f"mensaje {i}",
+            "direction": "incoming",
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(app_module.COPY_THRESHOLD)
+    ]
+
+    with app.app_context():
+        app_module.store_messages(app, rows)
+        assert app_module.ChatMessage.query.count() == app_module.COPY_THRESHOLD
@@ -0,0 +1,70 @@
+import threading
+import time
+from datetime import datetime
+
+import app as app_module
+
+
+def test_inbox_writer_starts_on_first_webhook(app):
+    assert app.extensions["inbox"]["thread"] is None
+
+    response = app.test_client().post(
+        "/webhook/green",
+        json={
+            "body": {
+                "typeWebhook": "incomingMessageReceived",
+                "senderData": {"chatId": "34600000000@c.us"},
+                "messageData": {
+                    "typeMessage": "textMessage",
+                    "textMessageData": {"textMessage": "hola"},
+                },
+            }
+        },
+    )
+
+    assert response.status_code == 200
+    assert app.extensions["inbox"]["thread"].is_alive()
+    deadline = time.monotonic() + 2
+    with app.app_context():
+        while app_module.ChatMessage.query.count() == 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+
+def _row(message):
+    return {
+        "chat_id": "34600000000@c.us",
+        "message": message,
+        "direction": "incoming",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def test_inbox_drops_only_rows_the_database_rejects(app, monkeypatch):
+    monkeypatch.setattr(app_module, "INBOX_RETRY_DELAY", 0)
+    store_messages = app_module.store_messages
+
+    def picky_store(app, rows):
+        if any(row["message"] == "malo" for row in rows):
+            raise ValueError("NUL byte")
+        store_messages(app, rows)
+
+    monkeypatch.setattr(app_module, "store_messages", picky_store)
+
+    app_module._write_inbox_rows(app, [_row("uno"), _row("malo"), _row("dos")])
+
+    with app.app_context():
+        messages = {msg.message for msg in app_module.ChatMessage.query.all()}
+    assert messages == {"uno", "dos"}
+
+
+def test_inbox_writer_is_restarted_when_dead(app):
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    app.extensions["inbox"]["thread"] = dead
+
+    app_module.start_inbox_writer(app)
+
+    assert app.extensions["inbox"]["thread"] is not dead
+    assert app.extensions["inbox"]["thread"].is_alive()